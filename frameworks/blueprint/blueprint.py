@@ -23,7 +23,6 @@ from . import logger
 
 from FlexiLynx.core.util import base85
 from FlexiLynx.core.util import pack
-from FlexiLynx.core.util import maptools
 from FlexiLynx.core.util import typing as ftyping
 from FlexiLynx.core.util.net import fetch1
 from FlexiLynx.core.util.functools import defaults, DEFAULT
@@ -78,14 +77,15 @@ class Blueprint:
         if isinstance(self.relations, dict): self.relations = parts.Relations(**self.relations)
 
     SIMPLE_KEYS = ('id', 'rel', 'name', 'desc', 'version', 'url')
-    def serialize_to_dict(self) -> dict:
-        return {k: getattr(self, k) for k in self.SIMPLE_KEYS} | {
-            'main': self.main.serialize_to_dict(),
-            'drafts': None if self.drafts is None else \
-                maptools.map_vals(parts.Manifest.serialize_to_dict, self.drafts),
-            'crypt': self.crypt.serialize_to_dict(),
-            'relations': None if self.relations is None else self.relations.serialize_to_dict(),
-        }
+    def serialize_to_dict(self, *, strip_sig: bool = False) -> dict:
+        '''If `strip_sig` is true, the signature is replaced with `NotImplemented` (see `Crypt.serialize_to_dict()`)'''
+        # built in place, as this is on the hot path of `.compile()` (key order must not change, as it is signed)
+        dct = {k: getattr(self, k) for k in self.SIMPLE_KEYS}
+        dct['main'] = self.main.serialize_to_dict()
+        dct['drafts'] = None if self.drafts is None else {n: m.serialize_to_dict() for n,m in self.drafts.items()}
+        dct['crypt'] = self.crypt.serialize_to_dict(strip_sig=strip_sig)
+        dct['relations'] = None if self.relations is None else self.relations.serialize_to_dict()
+        return dct
     def serialize(self, **json_args) -> str:
         return json.dumps(self.serialize_to_dict(), indent=4, **json_args)
     @classmethod
@@ -96,9 +96,7 @@ class Blueprint:
         return cls.deserialize_from_dict(json.loads(data))
     def compile(self) -> bytes:
         '''Compiles this `Blueprint` for signing / verifying'''
-        dct = self.serialize_to_dict()
-        dct['crypt']['sig'] = NotImplemented
-        return pack.pack(dct)
+        return pack.pack(self.serialize_to_dict(strip_sig=True))
 
     @defaults(crypt.sign)
     def sign(self, key: EdPrivK, *, test: bool = DEFAULT):
@@ -133,11 +131,13 @@ class Blueprint:
                                     from_key, key)
 
     KeyUpdate = Enum('KeyUpdate', ('MIGRATE_SELF', 'MIGRATE_OTHER', 'MIGRATE_BOTH', 'FAIL', 'IGNORE'))
-    def update(self, url: str | None = None, *, fetchfn: typing.Callable[[str], bytes] = fetch1,
+    def update(self, url: str | None = None, *, fetchfn: typing.Callable[[str, ...], bytes] = fetch1, revalidate: bool = True,
                verify: bool = True, verify_self: bool = False, key_update: KeyUpdate = KeyUpdate.MIGRATE_BOTH) -> typing.Self:
         '''
             Fetches an update for this `Blueprint`, returning the *new* `Blueprint`
             If `url` is not `None`, it overrides this `Blueprint`'s `.url`
+            `fetchfn` is called as `fetchfn(url, revalidate=revalidate)`
+                by default, `revalidate` makes it revalidate previously fetched blueprints with a conditional request instead of refetching them
             Runs `Blueprint.verify()` on the new `Blueprint` if `verify` is true,
                 and `Blueprint.verify()` on the current `Blueprint` if `verify_self` is true
             If the new `Blueprint`'s key is different from the current one, then `key_update` determines the behavior:
@@ -156,14 +156,17 @@ class Blueprint:
         if verify_self:
             logger.info('Verifying self')
             self.verify()
-        other = self.deserialize(fetchfn(url).decode())
+        other = self.deserialize(fetchfn(url, revalidate=revalidate).decode())
         if verify:
             logger.info('Verifying other')
             other.verify()
-        if self.crypt.key != other.crypt.key:
+        # serialize each key once, for both the comparison and the warning
+        skb = None if self.crypt.key is None else self.crypt.key.public_bytes_raw()
+        okb = None if other.crypt.key is None else other.crypt.key.public_bytes_raw()
+        if skb != okb:
             logger.warning(f'Key mismatch, taking action {key_update!r} on:\n'
-                           f'Self:  {base85.encode(self.crypt.key.public_bytes_raw())}\n'
-                           f'Other: {base85.encode(other.crypt.key.public_bytes_raw())}')
+                           f'Self:  {None if skb is None else base85.encode(skb)}\n'
+                           f'Other: {None if okb is None else base85.encode(okb)}')
             if key_update is self.KeyUpdate.MIGRATE_BOTH:
                 if self.crypt.key is None:
                     if other.crypt.key is None:
@@ -17,6 +17,8 @@ from types import SimpleNamespace
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey as EdPubK
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey as EdPrivK
+
+from . import crypt
 #</Imports
 
 #> Header >/
@@ -93,14 +95,18 @@ def gen_trust(voucher: Types.VoucherPrK, vouchee: Types.Vouchee, desc: str | Non
     '''Generates a trust, where `voucher` vouches for `vouchee`'''
     pubk = voucher.public_key()
     return Trust(voucher=pubk, vouchee=vouchee, signature=voucher.sign(pubk.public_bytes_raw() + vouchee.public_bytes_raw()), desc=desc)
+def _check_trust(trust: Trust, voucher_b: bytes, vouchee_b: bytes) -> bool:
+    # verifies a trust given the raw bytes of its keys, which callers usually already have
+    return crypt._verify_cached(trust.voucher, trust.signature, voucher_b + vouchee_b)
 def run_trust(trust: Trust, *, no_exc: bool = False) -> bool | None:
-    '''Executes a trust, raising an `InvalidSignature` if it's invalid (or returning `False` if `no_exc`)'''
-    if not no_exc:
-        trust.voucher.verify(trust.signature, trust.voucher.public_bytes_raw() + trust.vouchee.public_bytes_raw())
-        return None
-    try: trust.voucher.verify(trust.signature, trust.voucher.public_bytes_raw() + trust.vouchee.public_bytes_raw())
-    except InvalidSignature: return False
-    return True
+    '''
+        Executes a trust, raising an `InvalidSignature` if it's invalid (or returning `False` if `no_exc`)
+        Results are cached alongside `Blueprint` verifications, so re-walking the same cascade is cheap
+    '''
+    if _check_trust(trust, trust.voucher.public_bytes_raw(), trust.vouchee.public_bytes_raw()):
+        return True if no_exc else None
+    if no_exc: return False
+    raise InvalidSignature('Trust failed verification')
 ## Cascades
 ### Adding
 def add_trust(casc: Types.Cascade, trust: Trust, *, overwrite: bool = False):
@@ -125,12 +131,14 @@ def pop(casc: Types.Cascade, voucher: Types.Voucher) -> Trust:
     '''Removes and returns a `Trust` from `casc`'''
     casc.pop(voucher.public_bytes_raw())
 ### Executing
+def _walk(casc: Types.Cascade, kb: bytes) -> typing.Generator[tuple[Trust, bytes], None, None]:
+    # yields each trust along with its vouchee's raw bytes, which are carried forward as the next lookup key
+    while (trust := casc.get(kb, None)) is not None:
+        kb = trust.vouchee.public_bytes_raw()
+        yield (trust, kb)
 def walk(casc: Types.Cascade, from_: Types.Voucher) -> typing.Generator[Trust, None, None]:
     '''Walks `casc`, starting at `from_` and yielding `Trust`s in a chain'''
-    k = from_
-    while (kb := k.public_bytes_raw()) in casc:
-        yield casc[kb]
-        k = casc[kb].vouchee
+    for trust,_ in _walk(casc, from_.public_bytes_raw()): yield trust
 def execute(casc: Types.Cascade, from_: Types.Voucher, to: Types.Vouchee, *, sane_check: bool = True, return_code: bool = False) -> None | ExecutionReturn:
     '''
         Walks `casc`, starting at `from_` and verifying `Trust`s in the chain until `to` is reached
@@ -142,23 +150,29 @@ def execute(casc: Types.Cascade, from_: Types.Voucher, to: Types.Vouchee, *, san
         Returns `None` on success, or `ExecutionReturn.SUCCESS` if `return_code`
         If `sane_check` is true, then the keys of the cascade are check to ensure that they match the `Trust`s
     '''
-    if from_ == to: return None
+    # keys are compared as raw bytes, which are needed for walking anyway
+    fromb = from_.public_bytes_raw(); tob = to.public_bytes_raw()
+    if fromb == tob: return None
     seen = set()
     _last = None
-    for trust in walk(casc, from_):
+    kb = fromb # the key that `trust` was found under
+    for trust,veb in _walk(casc, fromb):
         if id(trust) in seen:
             if return_code: return ExecutionReturn.CIRCULAR
             raise CircularCascadeError(f'Cascade execution detected a circular cascade at {id(trust)} and refused to continue', cascade=casc, at=id(trust))
         seen.add(id(trust))
-        if sane_check and (casc.get(trust.voucher.public_bytes_raw(), None) is not trust):
+        vrb = trust.voucher.public_bytes_raw() # used for both the sanity check and the signed message
+        # `trust` was just looked up under `kb`, so it is only necessary to look it up again when the keys differ
+        if sane_check and (vrb != kb) and (casc.get(vrb, None) is not trust):
             if return_code: return ExecutionReturn.INSANE
             raise InsaneCascadeError(f'Cascade execution detected an insane cascade at'
-                                     f'{id(casc[trust.voucher.public_bytes_raw()])} / {id(trust)} and refused to continue', cascade=casc, at=id(trust))
-        if not run_trust(trust, no_exc=True):
+                                     f'{id(casc.get(vrb, None))} / {id(trust)} and refused to continue', cascade=casc, at=id(trust))
+        if not _check_trust(trust, vrb, veb):
             if return_code: return ExecutionReturn.INVALID_SIGNATURE
             raise VerificationError(f'Cascade execution failed to verify trust at {id(trust)}', cascade=casc, at=id(trust))
-        if to == trust.vouchee: return ExecutionReturn.SUCCESS if return_code else None
+        if veb == tob: return ExecutionReturn.SUCCESS if return_code else None
         _last = trust
+        kb = veb
     if return_code: return ExecutionReturn.BROKEN
     if _last is None:
         raise BrokenCascadeError(f'Cascade execution reached end of empty chain', cascade=casc, at=-1)
@@ -172,23 +186,42 @@ def concat(*cascs: Types.Cascade, mcasc: Types.MultiCasc | None = None) -> Types
             mcasc.setdefault(k, ())
             mcasc[k] += (t,)
     return mcasc
-def multiexec(mcasc: Types.MultiCasc, src: Types.Voucher, dst: Types.Vouchee, *, _outer: bool = True, _seen: set[int] | None = None) -> None | bool:
-    '''Executes a multi-cascade. Does not support exit-codes, only supports raising exceptions'''
-    if src == dst: return None
-    if _seen is None: _seen = set()
-    kb = src.public_bytes_raw()
-    if hash(kb) in _seen:
-        if not _outer: return False
-        raise CircularCascadeError(f'Multicascade execution encountered a circular chain at <h>{hash(kb)} and refused to continue', cascade=mcasc, at=hash(kb))
-    trusts = mcasc.get(kb, None)
+def multiexec(mcasc: Types.MultiCasc, src: Types.Voucher, dst: Types.Vouchee) -> None:
+    '''
+        Executes a multi-cascade. Does not support exit-codes, only supports raising exceptions
+        Each key is only searched from once, so circular chains (and chains shared between cascades) are not re-walked
+        Raises exceptions whenever a failure is encountered:
+            `VerificationError` when a `Trust` fails signature verification
+            `CircularCascadeError` when `dst` wasn't found and the search encountered at least one circular chain
+            `BrokenCascadeError` when `dst` wasn't found otherwise
+    '''
+    srcb = src.public_bytes_raw(); dstb = dst.public_bytes_raw()
+    if srcb == dstb: return None
+    trusts = mcasc.get(srcb, None)
     if trusts is None:
-        if not _outer: return False
         raise BrokenCascadeError(f'Multicascade execution reached end of chain at <mid>{id(trusts)}', cascade=mcasc, at=id(trusts))
-    for trust in trusts:
-        if not run_trust(trust, no_exc=True):
-            raise VerificationError(f'Multicascade execution failed to verify trust at <cid>{id(trust)} at the outer level', cascade=mcasc, at=id(trust))
-        if ((trust.vouchee == dst) # we found it
-                or multiexec(mcasc, trust.vouchee, dst, _outer=False, _seen=_seen)): # or someone else found it
-            return None if _outer else True
-    if not _outer: return False
-    raise BrokenCascadeError(f'Multicascade execution reached end of chain at <h>{hash(kb)}', cascade=mcasc, at=hash(kb))
+    # a key that has already been searched from can't reach `dst` (or the search would have ended),
+    #  so marking it both breaks cycles and prevents re-walking chains that are shared between cascades
+    seen = {srcb}
+    # searched depth-first with an explicit stack of each key's remaining trusts, so long chains can't exhaust the recursion limit
+    stack = [(srcb, iter(trusts))]
+    onpath = {srcb} # keys on the current chain, revisiting one of these (rather than a fully searched key) means the chain is circular
+    circ = None
+    while stack:
+        for trust in stack[-1][1]:
+            veb = trust.vouchee.public_bytes_raw()
+            if not _check_trust(trust, trust.voucher.public_bytes_raw(), veb):
+                raise VerificationError(f'Multicascade execution failed to verify trust at <cid>{id(trust)}', cascade=mcasc, at=id(trust))
+            if veb == dstb: return None # we found it
+            if veb in seen:
+                if (circ is None) and (veb in onpath): circ = veb
+                continue
+            seen.add(veb)
+            if (trusts := mcasc.get(veb, None)) is not None:
+                stack.append((veb, iter(trusts)))
+                onpath.add(veb)
+                break
+        else: onpath.discard(stack.pop()[0])
+    if circ is not None:
+        raise CircularCascadeError(f'Multicascade execution encountered a circular chain at <h>{hash(circ)} and refused to continue', cascade=mcasc, at=hash(circ))
+    raise BrokenCascadeError(f'Multicascade execution reached end of chain at <h>{hash(srcb)}', cascade=mcasc, at=hash(srcb))
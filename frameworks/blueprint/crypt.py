@@ -3,20 +3,44 @@
 '''Functions for signing and verifying `Blueprint`s'''
 
 #> Imports
+import hashlib
+from threading import Lock
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey as EdPrivK
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey as EdPubK
 #</Imports
 
 #> Header >/
-__all__ = ('sign', 'verify', 'cascade')
+__all__ = ('sign', 'verify', 'verify_many', 'cascade')
 
 # Simple signing and verifying
 def sign(bp: 'blueprint.Blueprint', key: EdPrivK, *, test: bool = True):
     '''Signs the `Blueprint` with `key`, optionally testing it with `verify()`'''
     bp.crypt.key = key.public_key()
-    bp.crypt.sig = key.sign(bp.compile())
-    if test: verify(bp)
+    data = bp.compile()
+    bp.crypt.sig = key.sign(data)
+    # the signature is not part of the compiled data, so it can be tested without recompiling
+    if test and not _verify_cached(bp.crypt.key, bp.crypt.sig, data):
+        raise InvalidSignature('Blueprint failed verification')
+VERIFY_CACHE_SIZE = 4096
+_verify_cache = {}
+_verify_cache_lock = Lock()
+def _verify_cached(key: EdPubK, sig: bytes, data: bytes) -> bool:
+    # Caches verification results on the raw key, signature, and a digest of the compiled data,
+    #  so any change to the `Blueprint` (or its key or signature) is a cache miss
+    # The digest keeps entries small; it is 256 bits so that colliding with a signed message is infeasible
+    ck = (key.public_bytes_raw(), sig, hashlib.blake2b(data, digest_size=32).digest())
+    # a single `.get()` is atomic, so lookups don't take the lock; it only guards the evict-then-insert below
+    if (res := _verify_cache.get(ck, None)) is not None: return res
+    try:
+        key.verify(sig, data) # the already-loaded key is used, rather than reloading it from its bytes
+        res = True
+    except InvalidSignature: res = False
+    with _verify_cache_lock:
+        if len(_verify_cache) >= VERIFY_CACHE_SIZE: # evict the oldest entry
+            _verify_cache.pop(next(iter(_verify_cache)))
+        _verify_cache[ck] = res
+    return res
 def verify(bp: 'blueprint.Blueprint', key: EdPubK | None = None, *, no_exc: bool = False) -> bool | None:
     '''
         Verifies that a `Blueprint` has not been tampered with
@@ -25,18 +49,44 @@ def verify(bp: 'blueprint.Blueprint', key: EdPubK | None = None, *, no_exc: bool
             returning `False`
         Note that `no_exc` will not stop `TypeError`s and `ValueError`s
             when `Blueprint` fields are missing
+        Results are cached, so verifying the same (unchanged) `Blueprint` multiple times is cheap
     '''
     if key is None: key = bp.crypt.key
     if key is None:
         raise TypeError('Blueprint is not a keyholder')
     if bp.crypt.sig is None:
         raise ValueError('Blueprint is unsigned')
-    if not no_exc:
-        key.verify(bp.crypt.sig, bp.compile())
-        return None
-    try: key.verify(bp.crypt.sig, bp.compile())
-    except InvalidSignature: return False
-    return True
+    if _verify_cached(key, bp.crypt.sig, bp.compile()):
+        return True if no_exc else None
+    if no_exc: return False
+    raise InvalidSignature('Blueprint failed verification')
+def verify_many(*bps: 'blueprint.Blueprint', no_exc: bool = False) -> tuple[bool, ...] | None:
+    '''
+        Verifies multiple `Blueprint`s, each with its own key
+        Identical blueprints (same key, signature, and contents) are only verified once
+        Raises an `InvalidSignature` on the first failure, unless `no_exc` is true,
+            in which case a tuple of results (in the same order as `bps`) is returned
+        See `verify()` for other exceptions
+    '''
+    # check every blueprint before compiling any of them, so an unsigned one fails without wasted work
+    for bp in bps:
+        if bp.crypt.key is None:
+            raise TypeError('Blueprint is not a keyholder')
+        if bp.crypt.sig is None:
+            raise ValueError('Blueprint is unsigned')
+    checks = {}
+    keys = {}
+    for bp in bps:
+        kb = bp.crypt.key.public_bytes_raw()
+        keys.setdefault(kb, bp.crypt.key)
+        checks.setdefault((kb, bp.crypt.sig, bp.compile()), []).append(bp)
+    results = {}
+    for (kb,sig,data),cbps in checks.items():
+        res = _verify_cached(keys[kb], sig, data)
+        if not (res or no_exc):
+            raise InvalidSignature(f'Blueprint {cbps[0].id!r} failed verification')
+        results.update(dict.fromkeys(map(id, cbps), res))
+    return tuple(results[id(bp)] for bp in bps) if no_exc else None
 
 # Cascading
 from . import cascade
@@ -4,8 +4,6 @@
 
 #> Imports
 import typing
-import hashlib
-import multiprocessing.pool
 from pathlib import Path
 
 from . import parts
@@ -21,10 +19,14 @@ from FlexiLynx.core.util.functools import defaults, DEFAULT
 __all__ = ('hash_files', 'make_manifest')
 
 @defaults(hashtools.hash_files)
-def hash_files(root: Path, files: typing.Iterable[str], *, max_threads: int = DEFAULT, hash_method: str = DEFAULT_HASH_ALGORITHM) -> dict[str, bytes]:
-    '''Hashes a set of files, prepending them with `root`'''
+def hash_files(root: Path, files: typing.Iterable[str], *, max_threads: int = DEFAULT, hash_method: str = DEFAULT_HASH_ALGORITHM,
+               missing_ok: bool = DEFAULT) -> dict[str, bytes | None]:
+    '''
+        Hashes a set of files, prepending them with `root`
+        If `missing_ok` is true, missing files are hashed as `None` instead of raising `FileNotFoundError`
+    '''
     paths = {root/f: f for f in files}
-    return {paths[p]: h for p,h in hashtools.hash_files(*paths.keys(), max_threads=max_threads, hash_method=hash_method).items()}
+    return {paths[p]: h for p,h in hashtools.hash_files(*paths.keys(), max_threads=max_threads, hash_method=hash_method, missing_ok=missing_ok).items()}
 
 @defaults(hash_files)
 def make_manifest(url: str | None, *files: Path, root: Path = Path('.'), max_threads: int = DEFAULT, hash_method: str = DEFAULT) -> parts.Manifest:
@@ -4,8 +4,9 @@
 
 #> Imports
 import json
-import shutil
+import time
 import typing
+import logging
 import operator
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -59,15 +60,15 @@ class BasePackage:
         return artifacts
 
     @defaults(Blueprint.update)
-    def update(self, url: str | None = DEFAULT, *, fetchfn: typing.Callable[[str], bytes] = DEFAULT,
+    def update(self, url: str | None = DEFAULT, *, fetchfn: typing.Callable[[str, ...], bytes] = DEFAULT, revalidate: bool = DEFAULT,
                verify: bool = DEFAULT, verify_self: bool = DEFAULT, key_update: Blueprint.KeyUpdate = DEFAULT):
         '''
             Updates this package's underlying blueprint
             See `help(Blueprint.update)` for information on arguments
         '''
         logger.debug('Issuing update to blueprint through package')
-        logger.trace(f'{url=!r} {fetchfn=!r} {verify=!r} {verify_self=!r} {key_update=!r}')
-        self.blueprint = self.blueprint.update(url, fetchfn=fetchfn, verify=verify, verify_self=verify_self, key_update=key_update)
+        logger.trace(f'{url=!r} {fetchfn=!r} {revalidate=!r} {verify=!r} {verify_self=!r} {key_update=!r}')
+        self.blueprint = self.blueprint.update(url, fetchfn=fetchfn, revalidate=revalidate, verify=verify, verify_self=verify_self, key_update=key_update)
 
 class FilesPackage(BasePackage):
     '''Allows executing package-related file manipulation'''
@@ -78,25 +79,44 @@ class FilesPackage(BasePackage):
         nomatch: dict[str, Artifact]
         missing: dict[str, Artifact]
     @defaults(hash_files)
-    def scan(self, location: Path, *drafts: str, max_threads: int = DEFAULT) -> ScanResult:
+    def scan(self, location: Path, *drafts: str, max_threads: int = DEFAULT,
+             hash_cache: dict[str, tuple[int, int, str, bytes]] | None = None) -> ScanResult:
         '''
             Returns a `ScanResult` of the files on the filesystem
             See `select()` for information on ordering of `drafts`
+            If `hash_cache` is given, files whose size and modification time match their entry are not rehashed,
+                and newly hashed files are added to it (entries are `(st_size, st_mtime_ns, hashfn, hash)`)
         '''
         logger.debug(f'Scanning location: {location}')
         logger.trace(f'{location=!r}, {drafts=!r}, {max_threads=!r}')
-        files = self.select(*drafts)
         to_hash = {}
-        missing = {}
-        for fn,art in files.items():
-            if (location/fn).exists():
-                to_hash.setdefault(art.hashfn, {})
-                to_hash[art.hashfn][fn] = art
-            else: missing[fn] = art
-        matches = {}; nomatch = {}
+        stats = {}
+        matches = {}; nomatch = {}; missing = {}
+        for fn,art in self.select(*drafts).items():
+            if hash_cache is not None:
+                try: st = (location/fn).stat()
+                except (FileNotFoundError, NotADirectoryError):
+                    missing[fn] = art
+                    continue
+                stats[fn] = (st.st_size, st.st_mtime_ns)
+                if ((c := hash_cache.get(fn)) is not None) and (c[:3] == (*stats[fn], art.hashfn)):
+                    (matches if c[3] == art.hash else nomatch)[fn] = art
+                    continue
+            to_hash.setdefault(art.hashfn, {})
+            to_hash[art.hashfn][fn] = art
+        if hash_cache is not None:
+            logger.verbose(f'scan: {len(stats) - sum(map(len, to_hash.values()))} file(s) unchanged since last scan, skipping rehash')
+        # files modified this recently could still be changed again without their mtime changing, so they are not cached
+        settled = time.time_ns() - 2_000_000_000
         for hfn,arts in to_hash.items():
-            for f,h in hash_files(location, arts.keys(), max_threads=max_threads, hash_method=hfn).items():
+            # missing files are detected whilst hashing, rather than checking that each one exists beforehand
+            for f,h in hash_files(location, arts.keys(), max_threads=max_threads, hash_method=hfn, missing_ok=True).items():
+                if h is None:
+                    missing[f] = arts[f]
+                    continue
                 (matches if h == arts[f].hash else nomatch)[f] = arts[f]
+                if (hash_cache is not None) and (stats[f][1] < settled):
+                    hash_cache[f] = (*stats[f], hfn, h)
         return self.ScanResult(matches=matches, nomatch=nomatch, missing=missing)
 
     @defaults(hash_many)
@@ -128,10 +148,12 @@ class FilesPackage(BasePackage):
             to_hash[artifacts[fn].hashfn][fn] = cont
         hashes = {}
         for hfn,fs in to_hash.items():
-            logger.trace(f'Hashing {sorted(fs.keys())} with {hfn!r}')
+            if logger.isEnabledFor(logging.TRACE): # don't sort every filename just to discard the message
+                logger.trace(f'Hashing {sorted(fs.keys())} with {hfn!r}')
             hashes.update(zip(fs.keys(), hash_many(*fs.values(), hash_method=hfn)))
         ahashes = dict(zip(artifacts.keys(), map(operator.attrgetter('hash'), artifacts.values())))
-        logger.trace(f'\nArtifact hashes:\n{ahashes}\nDownloaded hashes:\n{hashes}')
+        if logger.isEnabledFor(logging.TRACE): # don't render every hash just to discard the message
+            logger.trace(f'\nArtifact hashes:\n{ahashes}\nDownloaded hashes:\n{hashes}')
         if hashes != ahashes:
             mism = sorted(fn for fn,h in hashes.items() if h != ahashes[fn])
             logger.error('Artifact hashes do not match downloaded content')
@@ -159,27 +181,31 @@ class FilesPackage(BasePackage):
             for fn in scan.missing.keys():
                 logger.verbose(f'Copying new file {fn}')
                 (location/fn).parent.mkdir(exist_ok=True, parents=True)
-                shutil.copy(tmpdir/fn, location/fn)
+                fstools.atomic_copy(tmpdir/fn, location/fn)
             for fn in scan.nomatch.keys():
                 logger.verbose(f'Overwriting {fn}')
                 (location/fn).parent.mkdir(exist_ok=True, parents=True)
-                shutil.copy(tmpdir/fn, location/fn)
+                fstools.atomic_copy(tmpdir/fn, location/fn)
 
 class FilesystemPackage(FilesPackage):
     '''
         Represent an actual package on the filesystem
         The path specified by `at` must, at the very least, exist and contain `blueprint.json`
     '''
-    __slots__ = ('at', 'drafts', 'files', '_lock', 'flock')
+    __slots__ = ('at', 'drafts', 'files', 'hashes', '_lock', 'flock')
 
     def __init__(self, at: Path):
         self.at = at
         super().__init__(Blueprint.deserialize((self.at/'blueprint.json').read_text()))
         if (self.at/'package_db.pakd').exists():
-            self.drafts, self.files = map(set, pack.unpack((self.at/'package_db.pakd').read_bytes()))
+            db = pack.unpack((self.at/'package_db.pakd').read_bytes())
+            self.drafts, self.files = map(set, db[:2])
+            # older databases do not have a hash cache
+            self.hashes = dict(db[2]) if len(db) > 2 else {}
         else:
             self.drafts = set()
             self.files = set()
+            self.hashes = {}
         self._lock = RLock()
         self.flock = FLock(self.at/'package.lock', self._lock)
         self.save()
@@ -194,12 +220,12 @@ class FilesystemPackage(FilesPackage):
                 (to/'blueprint.json').write_text(self.blueprint.serialize())
             if save_db:
                 logger.verbose(f'Saving package database to {to/"package_db.pakd"}')
-                (to/'package_db.pakd').write_bytes(pack.pack(self.drafts, self.files))
+                (to/'package_db.pakd').write_bytes(pack.pack(self.drafts, self.files, self.hashes))
 
     @defaults(FilesPackage.synchronize)
     def sync(self, *, use_safe_sync: bool = True, max_threads: int = DEFAULT,
              reject_mismatch: bool = DEFAULT, fetchfn: typing.Callable[[str, ...], tuple[bytes, ...]] = DEFAULT,
-             clean_pycache: bool = True, clean_empty: bool = True, save_after: bool = True):
+             clean_pycache: bool = True, clean_empty: bool = True, save_after: bool = True, trust_stat_cache: bool = False):
         '''
             Upgrades and synchronizes this this package and the file database, automatically using `.scan()` and `.[safe_]synchronize()`
                 Additionally removes tracked files that are no longer needed
@@ -208,6 +234,9 @@ class FilesystemPackage(FilesPackage):
             `clean_pycache` runs `FlexiLynx.core.util.fstools.clean_pycache()` on `.at` pre-sync
             `clean_empty` runs `FlexiLynx.core.util.fstools.clean_empty()` on `.at` post-sync
             `save_after` runs `.save()` after syncing
+            `trust_stat_cache` skips rehashing files whose size and modification time match `.hashes` (see `.scan()`)
+                this only checks metadata rather than integrity: a file modified without changing either is not detected
+                otherwise, every file is rehashed and the cache is rebuilt
             Differs from `.[safe_]synchronize()` as this operates on *the* package installed on the filesystem that this `FilesystemPackage` points to,
                 rather than to any location as `FilesPackage.[safe_]synchronize()` does
         '''
@@ -218,9 +247,11 @@ class FilesystemPackage(FilesPackage):
                 logger.verbose('sync: cleaning pycache files')
                 fstools.clean_pycache(self.at)
             logger.verbose('sync: executing scan()')
-            sres = self.scan(self.at, *self.drafts, max_threads=max_threads)
-            chfiles = frozenset(sres.nomatch.keys() | sres.missing.keys())
-            rmfiles = self.files - sres.matches.keys() - chfiles
+            if not trust_stat_cache: self.hashes = {}
+            sres = self.scan(self.at, *self.drafts, max_threads=max_threads, hash_cache=self.hashes)
+            # each set is built in a single pass, rather than through intermediate sets
+            chfiles = frozenset().union(sres.nomatch.keys(), sres.missing.keys())
+            rmfiles = self.files.difference(sres.matches.keys(), chfiles)
             if not (chfiles or rmfiles):
                 logger.terse('sync: nothing to do')
                 return
@@ -238,6 +269,8 @@ class FilesystemPackage(FilesPackage):
             logger.info('sync: updating file database')
             self.files.clear()
             self.files.update(chfiles, sres.matches.keys())
+            # changed files are rehashed next time, and untracked files (such as those of deselected drafts) are dropped so the database doesn't grow
+            for f in chfiles.union(self.hashes.keys() - self.files): self.hashes.pop(f, None)
             if clean_empty:
                 logger.verbose('sync: cleaning empty directories')
                 fstools.clean_empty(self.at)
@@ -267,6 +300,7 @@ class FilesystemPackage(FilesPackage):
                 logger.info(f'remove: removing {f}')
                 f.unlink()
             self.files.clear()
+            self.hashes.clear()
             if deselect_drafts:
                 logger.info('remove: purging drafts database')
                 self.drafts.clear()
@@ -306,6 +340,7 @@ class FilesystemPackage(FilesPackage):
                 logger.info(f'purge: removing {f}')
                 f.unlink()
             self.files.clear()
+            self.hashes.clear()
             if deselect_drafts:
                 logger.info('purge: purging drafts database')
                 self.drafts.clear()
@@ -15,7 +15,7 @@ from . import cascade
 from . import DEFAULT_HASH_ALGORITHM
 
 from FlexiLynx.core.util import base85
-from FlexiLynx.core.util import maptools
+from FlexiLynx.core.util import hashtools
 #</Imports
 
 #> Header >/
@@ -31,15 +31,38 @@ class Manifest:
     files: dict[str, bytes | str]
 
     def __post_init__(self):
-        self.files = {f: base85.decode(h) if isinstance(h, str) else h
-                      for f,h in self.files.items()}
+        self.files = dict(self.files)
+        if (encd := {f: h for f,h in self.files.items() if isinstance(h, str)}):
+            self.files.update(zip(encd.keys(), base85.decode_many(*encd.values())))
     def serialize_to_dict(self) -> dict:
         return {
             'url': self.url,
             'hash_method': self.hash_method,
-            'files': maptools.map_vals(base85.encode, self.files),
+            'files': dict(zip(self.files.keys(), base85.encode_many(*self.files.values()))),
         }
 
+    def merkle_leaves(self) -> tuple[bytes, ...]:
+        '''Returns the Merkle tree leaves of this manifest's files: each file's name and hash, sorted by name'''
+        return tuple(f.encode() + b'\x00' + h for f,h in sorted(self.files.items()))
+    def merkle_root(self) -> bytes:
+        '''Computes the root of the Merkle tree over this manifest's files, using its `hash_method`'''
+        return hashtools.merkle_root(*self.merkle_leaves(), hash_method=self.hash_method)
+    def merkle_proof(self, file: str) -> tuple[tuple[bool, bytes], ...]:
+        '''
+            Generates an inclusion proof that `file` (with its hash) is part of this manifest
+            Raises `KeyError` if `file` is not in this manifest
+        '''
+        if file not in self.files:
+            raise KeyError(file)
+        return hashtools.merkle_proof(sorted(self.files.keys()).index(file), *self.merkle_leaves(), hash_method=self.hash_method)
+    def merkle_verify(self, file: str, hash: bytes, proof: typing.Iterable[tuple[bool, bytes]], root: bytes | None = None) -> bool:
+        '''
+            Checks that `file` with `hash` is a member of the Merkle tree with `root` using a `proof` from `.merkle_proof()`
+                If `root` is `None`, this manifest's `.merkle_root()` is used
+        '''
+        return hashtools.merkle_verify(file.encode() + b'\x00' + hash, proof,
+                                       self.merkle_root() if root is None else root, hash_method=self.hash_method)
+
 @_dc
 class Crypt:
     '''Holds necessary parts for cryptography, namely a key, signature, and the cascade-ring'''
@@ -53,13 +76,17 @@ class Crypt:
 
     @staticmethod
     def _to_key(key: EdPubK | bytes | str) -> EdPubK:
+        if isinstance(key, EdPubK): return key # already loaded; the common in-memory path
         if isinstance(key, str):
             return EdPubK.from_public_bytes(base85.decode(key))
-        elif isinstance(self.key, bytes):
+        elif isinstance(key, bytes):
             return EdPubK.from_public_bytes(key)
         return key
     @classmethod
     def _to_trust(cls, tr: typing.Sequence | typing.Mapping) -> cascade.Trust:
+        if isinstance(tr, cascade.Trust) and isinstance(tr.voucher, EdPubK) \
+               and isinstance(tr.vouchee, EdPubK) and isinstance(tr.signature, bytes):
+            return tr # already a fully-loaded `Trust`, nothing to convert
         if isinstance(tr, typing.Mapping):
             tr = (tr['voucher'], tr['vouchee'], tr['signature'], tr.get('desc', None))
         return cascade.Trust(voucher=cls._to_key(tr[0]), vouchee=cls._to_key(tr[1]),
@@ -75,10 +102,11 @@ class Crypt:
         if self.cascade is None: return
         self.cascade = {vkb if isinstance(vkb, bytes) else base85.decode(vkb): self._to_trust(trust)
                         for vkb,trust in self.cascade.items()} # vkb,(vk,tk,s) -> vouching key bytes,(vouching key,target key,signature)
-    def serialize_to_dict(self) -> dict:
+    def serialize_to_dict(self, *, strip_sig: bool = False) -> dict:
+        '''If `strip_sig` is true, the signature is replaced with `NotImplemented` instead of being encoded'''
         return {
             'key': None if self.key is None else base85.encode(self.key.public_bytes_raw()),
-            'sig': None if self.sig is None else base85.encode(self.sig),
+            'sig': NotImplemented if strip_sig else None if self.sig is None else base85.encode(self.sig),
             'cascade': None if self.cascade is None
                 else {base85.encode(vb): {
                         'voucher': base85.encode(tr.voucher.public_bytes_raw()),
@@ -14,6 +14,7 @@ from .module import Module
 from . import logger
 
 from FlexiLynx.core.util.parallel import mlock
+from FlexiLynx.core.frameworks.blueprint import crypt
 #</Imports
 
 #> Header >/
@@ -60,6 +61,17 @@ class Manager:
             logger.verbose(f'Discovered module in {p}, attempting to load')
             self.add_module(loader.create_module(p))
 
+    @mlock
+    def verify_modules(self, *, no_exc: bool = False) -> dict[str, bool] | None:
+        '''
+            Verifies the blueprints of every module at once, using `crypt.verify_many()`
+            Raises an `InvalidSignature` on the first failure, unless `no_exc` is true,
+                in which case a dictionary of module IDs to results is returned
+        '''
+        logger.verbose(f'Verifying blueprints of {len(self.modules)} module(s)')
+        res = crypt.verify_many(*(m.package.blueprint for m in self.modules.values()), no_exc=no_exc)
+        return None if res is None else dict(zip(self.modules.keys(), res))
+
     LOAD_BIAS = ('library', 'hybrid', 'override', 'implementation')
     def load_order(self, max_after_passes: int = 8, fail_on_unstable: bool = False) -> tuple[str, ...]:
         '''
@@ -74,7 +86,8 @@ class Manager:
         '''
         logger.verbose(f'Generating load-order for {len(self.modules)} module(s)...')
         logger.debug('sort with bias LOAD_BIAS based on type, then module ID')
-        load_order = sorted(self.modules.keys(), key=lambda i: (self.LOAD_BIAS.index(self.modules[i].type), i))
+        bias = {t: n for n,t in enumerate(self.LOAD_BIAS)}
+        load_order = sorted(self.modules.keys(), key=lambda i: (bias[self.modules[i].type], i))
         logger.debug('generate after-map')
         after = {}
         for i in load_order:
@@ -13,6 +13,7 @@ from . import logger
 
 from FlexiLynx.core.frameworks import module
 from FlexiLynx.core.util.parallel import mlock
+from FlexiLynx.core.frameworks.blueprint import crypt
 #</Imports
 
 #> Header >/
@@ -61,6 +62,17 @@ class Manager:
             logger.verbose(f'Discovered plugin in {p}, attempting to add')
             self.add_plugin(loader.create_plugin(self.bound, p))
 
+    @mlock
+    def verify_plugins(self, *, no_exc: bool = False) -> dict[str, bool] | None:
+        '''
+            Verifies the blueprints of every plugin at once, using `crypt.verify_many()`
+            Raises an `InvalidSignature` on the first failure, unless `no_exc` is true,
+                in which case a dictionary of plugin IDs to results is returned
+        '''
+        logger.verbose(f'Verifying blueprints of {len(self.plugins)} plugin(s)')
+        res = crypt.verify_many(*(p.package.blueprint for p in self.plugins.values()), no_exc=no_exc)
+        return None if res is None else dict(zip(self.plugins.keys(), res))
+
     def load_order(self) -> tuple[str, ...]:
         '''
             Generates a loading order from the plugins
@@ -0,0 +1,20 @@
+#!/bin/python3
+
+'''
+    Unit tests for FlexiLynxCore
+        Run from the repository root with `python3 -m unittest discover -s tests -t .`
+        (`test.py` is a manual script, and is not part of these tests)
+'''
+
+#> Imports
+from pathlib import Path
+
+import __entrypoint__
+#</Imports
+
+#> Header >/
+__all__ = ('FlexiLynx',)
+
+__entrypoint__.__load__()
+__entrypoint__.__setup__(Path('/nonexistent')) # don't configure logging from `logging.toml`, which would write a log file
+FlexiLynx = __entrypoint__.FlexiLynx
@@ -0,0 +1,54 @@
+#!/bin/python3
+
+'''Tests for `frameworks.blueprint.cascade`'''
+
+#> Imports
+import unittest
+
+from . import FlexiLynx
+#</Imports
+
+#> Header >/
+cascade = FlexiLynx.core.frameworks.blueprint.crypt.cascade
+EdPrivK = FlexiLynx.core.frameworks.blueprint.crypt.EdPrivK
+
+class MultiexecTest(unittest.TestCase):
+    def setUp(self):
+        self.prks = [EdPrivK.generate() for _ in range(5)]
+        self.pubs = [k.public_key() for k in self.prks]
+    def casc(self, *links: tuple[int, int]) -> cascade.Types.Cascade:
+        c = {}
+        for a,b in links: cascade.add(c, self.prks[a], self.pubs[b])
+        return c
+
+    def test_chain(self):
+        mc = cascade.concat(self.casc((0, 1), (1, 2)), self.casc((2, 3)))
+        self.assertIsNone(cascade.multiexec(mc, self.pubs[0], self.pubs[3]))
+    def test_broken(self):
+        with self.assertRaises(cascade.BrokenCascadeError):
+            cascade.multiexec(cascade.concat(self.casc((0, 1), (1, 2))), self.pubs[2], self.pubs[0])
+    def test_circular(self):
+        # a cycle that cannot reach `dst`
+        with self.assertRaises(cascade.CircularCascadeError):
+            cascade.multiexec(cascade.concat(self.casc((0, 1), (1, 0))), self.pubs[0], self.pubs[3])
+    def test_shared_chain_is_not_circular(self):
+        # two cascades that lead to the same dead-end
+        mc = cascade.concat(self.casc((0, 1), (1, 3)), self.casc((0, 2), (2, 3)))
+        with self.assertRaises(cascade.BrokenCascadeError) as cm:
+            cascade.multiexec(mc, self.pubs[0], self.pubs[4])
+        self.assertNotIsInstance(cm.exception, cascade.CircularCascadeError)
+    def test_cycle_beside_path(self):
+        mc = cascade.concat(self.casc((0, 1), (1, 0)), self.casc((0, 2), (2, 3)))
+        self.assertIsNone(cascade.multiexec(mc, self.pubs[0], self.pubs[3]))
+    def test_invalid_trust(self):
+        c = self.casc((0, 1))
+        kb = self.pubs[0].public_bytes_raw()
+        c[kb] = c[kb]._replace(signature=bytes(64))
+        with self.assertRaises(cascade.VerificationError):
+            cascade.multiexec(cascade.concat(c), self.pubs[0], self.pubs[1])
+    def test_deep_chain(self):
+        # longer than the default recursion limit
+        prks = [EdPrivK.generate() for _ in range(1500)]
+        c = {}
+        for a,b in zip(prks, prks[1:]): cascade.add(c, a, b.public_key())
+        self.assertIsNone(cascade.multiexec(cascade.concat(c), prks[0].public_key(), prks[-1].public_key()))
@@ -0,0 +1,42 @@
+#!/bin/python3
+
+'''Tests for `util.tools.fstools`'''
+
+#> Imports
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from . import FlexiLynx
+#</Imports
+
+#> Header >/
+fstools = FlexiLynx.core.util.fstools
+
+class AtomicCopyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.at = Path(self.tmpdir.name)
+        self.src = self.at/'src'
+        self.src.write_bytes(b'new')
+        self.src.chmod(0o644)
+        self.dst = self.at/'dst'
+
+    def test_replace_keeps_mode(self):
+        self.dst.write_bytes(b'old')
+        self.dst.chmod(0o755)
+        fstools.atomic_copy(self.src, self.dst)
+        self.assertEqual(self.dst.read_bytes(), b'new')
+        self.assertEqual(self.dst.stat().st_mode & 0o777, 0o755)
+        self.assertEqual(sorted(p.name for p in self.at.iterdir()), ['dst', 'src'])
+    def test_new_takes_src_mode(self):
+        fstools.atomic_copy(self.src, self.dst)
+        self.assertEqual(self.dst.read_bytes(), b'new')
+        self.assertEqual(self.dst.stat().st_mode & 0o777, 0o644)
+    def test_failure_cleans_up(self):
+        self.dst.write_bytes(b'old')
+        with self.assertRaises(FileNotFoundError):
+            fstools.atomic_copy(self.at/'nonexistent', self.dst)
+        self.assertEqual(self.dst.read_bytes(), b'old')
+        self.assertEqual(sorted(p.name for p in self.at.iterdir()), ['dst', 'src'])
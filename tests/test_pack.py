@@ -0,0 +1,37 @@
+#!/bin/python3
+
+'''Tests for `util.pack`'''
+
+#> Imports
+import unittest
+from fractions import Fraction
+
+from . import FlexiLynx
+#</Imports
+
+#> Header >/
+pack = FlexiLynx.core.util.pack
+
+class PackerTest(unittest.TestCase):
+    VALUES = {
+        bool: (True, False), int: (0, -5, 2**80), float: (1.5, -0.0), complex: (2+3j,), Fraction: (Fraction(1, 3),),
+        bytes: (b'', b'ab'), bytearray: (bytearray(b'x'),), str: ('', 'h\xe9'),
+        tuple: ((), (1, 'a')), list: ([1, [2]],), set: ({1, 2},), frozenset: (frozenset({3}),), dict: ({'a': (1,)},),
+    }
+
+    def test_covers_fast_path(self):
+        self.assertEqual(self.VALUES.keys(), pack.Packer.TYPE_TO_ENCODER.keys())
+    def test_round_trip(self):
+        for t,vals in self.VALUES.items():
+            for v in vals:
+                with self.subTest(type=t.__name__, value=v):
+                    r, = pack.unpack(pack.pack(v))
+                    self.assertEqual(r, v)
+                    self.assertIs(type(r), bytes if t is bytearray else t)
+    def test_round_trip_none(self):
+        self.assertEqual(pack.unpack(pack.pack(None, 1)), (None, 1))
+    def test_subclass_override(self):
+        class Packer(pack.Packer):
+            def _encode_str(self, o: str) -> tuple[pack.TypeKey, bytes]:
+                return super()._encode_str(o.upper())
+        self.assertEqual(Packer().unpack(Packer().pack('abc')), ('ABC',))
@@ -0,0 +1,58 @@
+#!/bin/python3
+
+'''Tests for `frameworks.blueprint.package`'''
+
+#> Imports
+import os
+import hashlib
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from . import FlexiLynx
+#</Imports
+
+#> Header >/
+blueprint = FlexiLynx.core.frameworks.blueprint
+
+class FilesystemPackageSyncTest(unittest.TestCase):
+    CONTENT = {'a': b'hello', 'sub/b': b'x'*1000}
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.at = Path(self.tmpdir.name)
+        bp = blueprint.Blueprint('test', 0, name='Test', crypt={'cascade': {}},
+                                 main={'url': 'http://x', 'files': {fn: hashlib.blake2b(c).digest() for fn,c in self.CONTENT.items()}})
+        (self.at/'blueprint.json').write_text(bp.serialize())
+        (self.at/'a').write_bytes(self.CONTENT['a'])
+        os.utime(self.at/'a', ns=(10**18, 10**18)) # recently modified files are not cached
+        self.fetched = []
+        self.pkg = blueprint.package.FilesystemPackage(self.at)
+        self.pkg.sync(fetchfn=self.fetch, save_after=False, trust_stat_cache=True)
+        self.assertEqual(self.pkg.files, set(self.CONTENT))
+        self.fetched.clear()
+    def fetch(self, *urls: str) -> tuple[bytes, ...]:
+        self.fetched.extend(urls)
+        return tuple(self.CONTENT[u.removeprefix('http://x/')] for u in urls)
+    def tamper(self):
+        # same size, and the modification time is restored
+        st = (self.at/'a').stat()
+        (self.at/'a').write_bytes(b'jello')
+        os.utime(self.at/'a', ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_same_stat_modification_detected(self):
+        self.tamper()
+        self.pkg.sync(fetchfn=self.fetch, save_after=False)
+        self.assertEqual(self.fetched, ['http://x/a'])
+        self.assertEqual((self.at/'a').read_bytes(), b'hello')
+    def test_same_stat_modification_trusted(self):
+        self.tamper()
+        self.pkg.sync(fetchfn=self.fetch, save_after=False, trust_stat_cache=True)
+        self.assertEqual(self.fetched, [])
+        self.assertEqual((self.at/'a').read_bytes(), b'jello')
+    def test_cache_pruned(self):
+        self.pkg.hashes['gone'] = (0, 0, 'blake2b', b'')
+        (self.at/'sub/b').unlink()
+        self.pkg.sync(fetchfn=self.fetch, save_after=False, trust_stat_cache=True)
+        self.assertEqual(self.pkg.hashes.keys(), {'a'})
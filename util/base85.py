@@ -13,27 +13,46 @@
 import re
 import base64
 import typing
+import itertools
 
 from .tools.retools import char_patt
 #</Imports
 
 #> Header >/
-__all__ = ('encode', 'bencode',
-           'decode', 'bdecode',
+__all__ = ('encode', 'bencode', 'encode_many',
+           'decode', 'bdecode', 'decode_many',
            'chars', 'patt')
 
 def encode(b: bytes) -> str:
     '''Encodes `b` in Base85 as a string'''
-    return bencode(b).decode()
+    return base64.b85encode(b).decode() # called directly, as this is used per-key and per-hash
 def bencode(b: bytes) -> bytes:
     '''Encodes `b` in Base85 as a byte-string'''
     return base64.b85encode(b)
+def encode_many(*bs: bytes) -> tuple[str, ...]:
+    '''
+        Encodes each of `bs` in Base85 as strings
+            When every length is a multiple of 4 (such as with most hash digests), they are all encoded together in one pass,
+                as Base85 encodes each 4-byte group independently
+    '''
+    if any(len(b) % 4 for b in bs): return tuple(map(encode, bs))
+    enc = encode(b''.join(bs))
+    return tuple(enc[s:e] for s,e in itertools.pairwise(itertools.accumulate((len(b) // 4 * 5 for b in bs), initial=0)))
 def decode(s: str) -> bytes:
     '''Decodes a Base85-encoded string `s` into bytes'''
-    return bdecode(s.encode())
+    return base64.b85decode(s) # accepts ASCII strings directly, so `s` isn't encoded first
 def bdecode(s: bytes) -> bytes:
     '''Decodes a Base85-encoded byte-string `s` into bytes'''
     return base64.b85decode(s)
 
+def decode_many(*ss: str) -> tuple[bytes, ...]:
+    '''
+        Decodes each of the Base85-encoded strings `ss` into bytes
+            When every length is a multiple of 5, they are all decoded together in one pass (see `encode_many()`)
+    '''
+    if any(len(s) % 5 for s in ss): return tuple(map(decode, ss))
+    dec = decode(''.join(ss))
+    return tuple(dec[s:e] for s,e in itertools.pairwise(itertools.accumulate((len(s) // 5 * 4 for s in ss), initial=0)))
+
 chars = set(base64.b85encode(bytes(range(0, 255*4//5-1))))
 patt = re.compile(char_patt(bytes(chars).decode()))
@@ -3,15 +3,17 @@
 #> Imports
 import io
 import lzma
+import zlib
 import typing
 import threading
 from enum import Enum
 from queue import SimpleQueue
-from http.client import HTTPResponse, HTTPMessage
-from urllib.request import urlopen, Request
+from urllib.error import HTTPError
 
 from .typing import Protocol
 from .parallel import mlock
+
+if typing.TYPE_CHECKING: import http.client # only for annotations, see `request()`
 #</Imports
 
 #> Header >/
@@ -117,12 +119,13 @@ class HTTPResponseCacher:
          - Response caching
          - Iterable chunked reading
          - Various helpful properties
+         - Transparent decoding of gzip-encoded (`Content-Encoding: gzip`) responses
         Note that the original `HTTPResponse` object should *never* be used again; it will certainly cause problems both ways
     '''
-    __slots__ = ('url', '_res', '_lock', '_rlock', '_data', '_len', '_comp', '_dcomp')
+    __slots__ = ('url', '_res', '_lock', '_rlock', '_data', '_len', '_comp', '_dcomp', '_tdcomp')
 
     _Compressor = Protocol('Compressor', 'Supported compression objects', compress=typing.Callable[[bytes], bytes], flush=typing.Callable[[], bytes])
-    def __init__(self, res: HTTPResponse, url: str | None = None, *, compressor: _Compressor | None = None, decompressor: typing.Callable[[bytes], bytes] = lzma.decompress):
+    def __init__(self, res: 'http.client.HTTPResponse', url: str | None = None, *, compressor: _Compressor | None = None, decompressor: typing.Callable[[bytes], bytes] = lzma.decompress):
         if getattr(res, '_cached_owned', False):
             raise TypeError('res is already owned')
         res._cached_owned = True
@@ -134,6 +137,8 @@ class HTTPResponseCacher:
         self._len = None
         self._comp = lzma.LZMACompressor() if compressor is None else compressor
         self._dcomp = decompressor
+        self._tdcomp = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16) \
+                       if res.headers.get('Content-Encoding', '').lower() == 'gzip' else None
 
     def close(self):
         '''Closes this response cacher, closing and deleting the underlying `HTTPResponse` and cached data'''
@@ -200,6 +205,9 @@ class HTTPResponseCacher:
             if reread: return self.data
             raise RuntimeError('Refusing to reread a completed cache when reread is false')
         data = self._res.read(amt)
+        if self._tdcomp is not None:
+            data = self._tdcomp.decompress(data)
+            if self._res.isclosed(): data += self._tdcomp.flush()
         self._data_add(data)
         if self._res.isclosed(): self._data_fin()
         return data
@@ -223,13 +231,17 @@ class HTTPResponseCacher:
             yield self.read(csize)
 
     @property
-    def headers(self) -> HTTPMessage:
+    def headers(self) -> 'http.client.HTTPMessage':
         if self.stat() is self.Stat.CLOSED: raise AttributeError('Cannot get headers from a closed response')
         return self._res.headers
 
     def rlength(self) -> int | None:
-        '''"Reported" length from the `Content-Length` header'''
+        '''
+            "Reported" length from the `Content-Length` header
+                This is `None` for gzip-encoded responses, as the header only reports the compressed length
+        '''
         if self.stat() is self.Stat.CLOSED: raise TypeError('Cannot get reported length from a closed response')
+        if self._tdcomp is not None: return None
         with self._rlock:
             return int(cl) if (cl := self.headers.get('Content-Length')) is not None else None
     def alength(self) -> int:
@@ -247,18 +259,35 @@ class HTTPResponseCacher:
 
 cache = {}
 def request(url: str, *, timeout: int | None = None, user_agent: str = 'Mozilla/5.0',
-            cache_dict: dict[int, HTTPResponseCacher] = cache, read_cache: bool = True, write_cache: bool = True) -> HTTPResponseCacher:
+            cache_dict: dict[int, HTTPResponseCacher] = cache, read_cache: bool = True, write_cache: bool = True,
+            revalidate: bool = False, accept_gzip: bool = True) -> HTTPResponseCacher:
     '''
         Requests data from `url`, constructing a `HTTPResponseCacher`
         Reads data from `cache` (or `cache_dict`, if given) if present when `read_cache` is true
+            If `revalidate` is also true, then a completely cached response is only reused after the server confirms
+                that it is unchanged through a conditional request (using the cached `ETag` and/or `Last-Modified` headers);
+                otherwise, the response is fetched again
         Adds data to `cache` (or `cache_dict`, if given) when `write_cache` is true
             Setting `write_cache` to true whilst `read_cache` is false is a good way to refresh a cached entry
+        If `accept_gzip` is true, then the server is allowed to gzip-encode the response,
+            which is transparently decoded by the `HTTPResponseCacher`
     '''
-    if read_cache:
-        hurl = URL.hash(url)
-        if (c := cache_dict.get(hurl, None)) is not None: return c
-    elif write_cache: hurl = URL.hash(url)
-    hrc = HTTPResponseCacher(urlopen(Request(url, headers={'User-Agent': user_agent}), timeout=timeout), url)
+    hurl = URL.hash(url)
+    headers = {'User-Agent': user_agent}
+    if accept_gzip: headers['Accept-Encoding'] = 'gzip'
+    c = None
+    if read_cache and ((c := cache_dict.get(hurl, None)) is not None):
+        if not revalidate: return c
+        if c.stat() is c.Stat.COMPLETE:
+            if (etag := c.headers.get('ETag')) is not None: headers['If-None-Match'] = etag
+            if (lmod := c.headers.get('Last-Modified')) is not None: headers['If-Modified-Since'] = lmod
+    # imported here, as `urllib.request` pulls in `http.client`, `email`, and `ssl`, which are slow to import and unneeded until a request is made
+    from urllib.request import urlopen, Request
+    try: res = urlopen(Request(url, headers=headers), timeout=timeout)
+    except HTTPError as e:
+        if (e.code != 304) or (c is None): raise
+        return c # not modified
+    hrc = HTTPResponseCacher(res, url)
     if write_cache: cache_dict[hurl] = hrc
     return hrc
 
@@ -290,10 +319,12 @@ def _fetchx_fsize(size: int | None, patt: str = '{:3.1f}{}', unknown: str = '?')
         size /= 1024.0
     return patt.format(size, u)
 def _fetchx_rsize(hrc: HTTPResponseCacher, perc: bool = True) -> str:
-    return (f'{_fetchx_fsize(hrc.alength())} /'
-            f' {_fetchx_fsize(hrc.rlength())}'
-            f'{f" <{hrc.alength() / hrc.rlength() * 100:3.1f}%>" if (perc and (hrc.rlength() is not None)) else ""}'
-            f' [comp.: {_fetchx_fsize(hrc.clength())} <{f"{hrc.clength() / hrc.alength() * 100:3.1f}" if hrc.alength() else "..."}%>]')
+    # each length takes the response's lock (and `rlength()` parses headers), so only fetch them once per line
+    alen = hrc.alength(); rlen = hrc.rlength(); clen = hrc.clength()
+    return (f'{_fetchx_fsize(alen)} /'
+            f' {_fetchx_fsize(rlen)}'
+            f'{f" <{alen / rlen * 100:3.1f}%>" if (perc and (rlen is not None)) else ""}'
+            f' [comp.: {_fetchx_fsize(clen)} <{f"{clen / alen * 100:3.1f}" if alen else "..."}%>]')
 def _fetchx_update(target: int | None, order: list[int], rmap: dict[int, HTTPResponseCacher], nmap: dict[int, str]) -> typing.Iterator[str]:
     if (target is not None) and (rmap[target].stat() is rmap[target].Stat.COMPLETE) and (target in order):
         order.remove(target)
@@ -353,6 +384,10 @@ def fetchx(*urls: str, csize: int = 512*1024, cache_limit_kib: int = 512, target
     for h in cdict.keys()-noadd.keys(): target_cache[h] = cdict[h]
     for hrc in noadd.values(): hrc.close()
     return data
-def fetch1(url: str, **fetchx_kwargs) -> bytes:
-    '''Convenience wrapper for only `fetchx()`-ing one URL'''
+def fetch1(url: str, *, revalidate: bool = False, **fetchx_kwargs) -> bytes:
+    '''
+        Convenience wrapper for only `fetchx()`-ing one URL
+        If `revalidate` is true, it is passed to `request()` (in addition to any `request_kwargs`)
+    '''
+    if revalidate: fetchx_kwargs['request_kwargs'] = fetchx_kwargs.get('request_kwargs', {}) | {'revalidate': True}
     return fetchx(url, **fetchx_kwargs)[0]
@@ -10,6 +10,7 @@ import itertools
 import dataclasses
 from ast import literal_eval
 from fractions import Fraction
+from functools import lru_cache
 from enum import Enum, IntEnum
 from collections import abc, namedtuple
 #</Imports
@@ -58,6 +59,7 @@ class Packer:
 
     # Size encoding / decoding
     @staticmethod
+    @lru_cache(maxsize=4096) # sizes are small and heavily repeated, and this is called for every packed object
     def _n_to_base(n: int, base: int) -> bytes:
         return bytes(((n % (base**p))) // (base**(p-1)) for p in range(1, math.ceil(1+math.log(n+1, base))))
     @staticmethod
@@ -72,65 +74,109 @@ class Packer:
         return self._n_from_base(bs, self._size_base) if bs else 0
 
     # Object encoding
-    def _try_encode_literal(self, o: object) -> str | None:
-        r = repr(o)
+    _LITERAL_ATOMS = frozenset({bool, int, str, bytes, type(None)})
+    @classmethod
+    def _is_literal(cls, o: object) -> bool | None:
+        # decides if `literal_eval(repr(o)) == o` for exact builtin types without parsing, returning `None` if it can't tell
+        t = type(o)
+        if t in cls._LITERAL_ATOMS: return True
+        if t is float: return math.isfinite(o) # `nan` and `inf` are not literals
+        if t is complex: return math.isfinite(o.real) and math.isfinite(o.imag)
+        if (t is tuple) or (t is list) or (t is set): elems = o
+        elif t is dict: elems = itertools.chain(o.keys(), o.values())
+        elif t is frozenset: return False # `frozenset(...)` is a call
+        else: return None
+        res = True
+        for e in elems:
+            if (er := cls._is_literal(e)) is False: return False
+            if er is None: res = None
+        return res
+    def _try_encode_literal(self, o: object, r: str | None = None) -> str | None:
+        if r is None: r = repr(o)
+        if (il := self._is_literal(o)) is not None: # avoids parsing the representation when possible
+            return r if il else None
         try: lo = literal_eval(r)
         except Exception: return None
         if o == lo: return r
         return None
+    ## Per-type encoders
+    def _encode_bool(self, o: bool) -> tuple[TypeKey, bytes]:
+        return ((TypeKey.TRUE if o else TypeKey.FALSE), b'')
+    def _encode_int(self, o: int) -> tuple[TypeKey, bytes]:
+        return (TypeKey.INT, o.to_bytes((o.bit_length() + 8) // 8, signed=True)
+                if (o or not self.optimize_do_blanking) else b'')
+    def _encode_float(self, o: float) -> tuple[TypeKey, bytes]:
+        if self.optimize_do_blanking and not o: return (TypeKey.FLOAT, b'')
+        # encode as a Fraction
+        fenc = self.encode(Fraction(o))[1]
+        # check if structs are smaller
+        if len(fenc) < self.S_DOUBLE.size: return (TypeKey.FLOAT, fenc)
+        # if so, use structs
+        try: return (TypeKey.FLOAT, self.S_DOUBLE.pack(o))
+        except struct.error: return (TypeKey.FLOAT, fenc) # structs failed, use Fraction
+    def _encode_complex(self, o: complex) -> tuple[TypeKey, bytes]:
+        if self.optimize_do_blanking and not o: return(TypeKey.COMPLEX, b'')
+        # recursively pack
+        pak = self.pack(o.real, o.imag)
+        # check if structs are smaller
+        if len(pak) < self.S_COMPLEX.size: return (TypeKey.COMPLEX, pak)
+        # if so, use structs
+        try: return (TypeKey.COMPLEX, self.S_COMPLEX.pack(o))
+        except struct.error: return (TypeKey.COMPLEX, pak) # structs failed, use recursive pack
+    def _encode_fraction(self, o: Fraction) -> tuple[TypeKey, bytes]:
+        n,d = o.limit_denominator(self.fraction_precision).as_integer_ratio()
+        np = n.to_bytes((n.bit_length() + 8) // 8, signed=True) \
+             if (n or not self.optimize_do_blanking) else b'' # numerator is signed and could be 0
+        dp = self._n_to_base(d, 254) # denominator is not and can't be 0, use the extra bit gained from signing for delimiter
+        return (TypeKey.FRACTION, np + b'\xFF' + dp)
+    def _encode_bytes(self, o: bytes | bytearray) -> tuple[TypeKey, bytes]:
+        return (TypeKey.BYTES, bytes(o))
+    def _encode_str(self, o: str) -> tuple[TypeKey, bytes]:
+        return (TypeKey.STR, o.encode(self.str_encoding))
+    def _encode_sequence(self, o: abc.Sequence) -> tuple[TypeKey, bytes]:
+        if hasattr(o, '_asdict') and (self.reduce_namedtuple != ReduceNamedtuple.AS_TUPLE):
+            # if it's a namedtuple and we don't treat namedtuples as tuples
+            if self.reduce_namedtuple is ReduceNamedtuple.FAIL:
+                raise TypeError('Refusing to reduce a namedtuple when reduce_namedtuple is FAIL')
+            if self.reduce_namedtuple is ReduceNamedtuple.AS_DICT: # render as a dict
+                return self.encode(o._asdict())
+            if self.reduce_namedtuple is ReduceNamedtuple.AS_NAMEDTUPLE:
+                return (TypeKey.NAMEDTUPLE, self.pack(o.__class__.__name__, o.__module__, *itertools.chain.from_iterable(o._asdict().items())))
+            raise ValueError(f'reduce_namedtuple is an illegal value: {self.reduce_namedtuple!r}')
+        return self._encode_tuple(o)
+    def _encode_tuple(self, o: abc.Sequence) -> tuple[TypeKey, bytes]:
+        return (TypeKey.TUPLE, self.pack(*(so for so in o)))
+    def _encode_set(self, o: abc.Set) -> tuple[TypeKey, bytes]:
+        return (TypeKey.SET, self.pack(*(so for so in o)))
+    def _encode_mapping(self, o: abc.Mapping) -> tuple[TypeKey, bytes]:
+        return (TypeKey.DICT, self.pack(*itertools.chain.from_iterable(o.items())))
+    # exact-type lookups, tried before falling back to `match`ing against subclasses and ABCs
+    # names rather than functions, so that subclasses can override the `_encode_*` methods
+    TYPE_TO_ENCODER = {
+        bool: '_encode_bool', int: '_encode_int', float: '_encode_float', complex: '_encode_complex', Fraction: '_encode_fraction',
+        bytes: '_encode_bytes', bytearray: '_encode_bytes', str: '_encode_str',
+        # exact tuples and lists can't be namedtuples, so skip the check
+        tuple: '_encode_tuple', list: '_encode_tuple', set: '_encode_set', frozenset: '_encode_set', dict: '_encode_mapping',
+    }
     def encode(self, o: object) -> tuple[TypeKey, bytes]:
         '''Encodes an object and returns it and its type-key'''
+        if (enc := self.TYPE_TO_ENCODER.get(type(o))) is not None:
+            return getattr(self, enc)(o)
         match o:
             # Numeric
-            case bool():
-                return ((TypeKey.TRUE if o else TypeKey.FALSE), b'')
-            case int():
-                return (TypeKey.INT, o.to_bytes((o.bit_length() + 8) // 8, signed=True)
-                        if (o or not self.optimize_do_blanking) else b'')
-            case float():
-                if self.optimize_do_blanking and not o: return (TypeKey.FLOAT, b'')
-                # encode as a Fraction
-                fenc = self.encode(Fraction(o))[1]
-                # check if structs are smaller
-                if len(fenc) < self.S_DOUBLE.size: return (TypeKey.FLOAT, fenc)
-                # if so, use structs
-                try: return (TypeKey.FLOAT, self.S_DOUBLE.pack(o))
-                except struct.error: return (TypeKey.FLOAT, fenc) # structs failed, use Fraction
-            case complex():
-                if self.optimize_do_blanking and not o: return(TypeKey.COMPLEX, b'')
-                # recursively pack
-                pak = self.pack(o.real, o.imag)
-                # check if structs are smaller
-                if len(pak) < self.S_COMPLEX.size: return (TypeKey.COMPLEX, pak)
-                # if so, use structs
-                try: return (TypeKey.COMPLEX, self.S_COMPLEX.pack(o))
-                except struct.error: return (TypeKey.COMPLEX, pak) # structs failed, use recursive pack
-            case Fraction():
-                n,d = o.limit_denominator(self.fraction_precision).as_integer_ratio()
-                np = n.to_bytes((n.bit_length() + 8) // 8, signed=True) \
-                     if (n or not self.optimize_do_blanking) else b'' # numerator is signed and could be 0
-                dp = self._n_to_base(d, 254) # denominator is not and can't be 0, use the extra bit gained from signing for delimiter
-                return (TypeKey.FRACTION, np + b'\xFF' + dp)
+            case bool(): return self._encode_bool(o)
+            case int(): return self._encode_int(o)
+            case float(): return self._encode_float(o)
+            case complex(): return self._encode_complex(o)
+            case Fraction(): return self._encode_fraction(o)
             # Sequences
             ## Simple
-            case bytes() | bytearray(): return (TypeKey.BYTES, bytes(o))
-            case str(): return (TypeKey.STR, o.encode(self.str_encoding))
+            case bytes() | bytearray(): return self._encode_bytes(o)
+            case str(): return self._encode_str(o)
             ## Recursive
-            case abc.Sequence():
-                if hasattr(o, '_asdict') and (self.reduce_namedtuple != ReduceNamedtuple.AS_TUPLE):
-                    # if it's a namedtuple and we don't treat namedtuples as tuples
-                    if self.reduce_namedtuple is ReduceNamedtuple.FAIL:
-                        raise TypeError('Refusing to reduce a namedtuple when reduce_namedtuple is FAIL')
-                    if self.reduce_namedtuple is ReduceNamedtuple.AS_DICT: # render as a dict
-                        return self.encode(o._asdict())
-                    if self.reduce_namedtuple is ReduceNamedtuple.AS_NAMEDTUPLE:
-                        return (TypeKey.NAMEDTUPLE, self.pack(o.__class__.__name__, o.__module__, *sum(tuple(o._asdict().items()), start=())))
-                    raise ValueError(f'reduce_namedtuple is an illegal value: {self.reduce_namedtuple!r}')
-                return (TypeKey.TUPLE, self.pack(*(so for so in o)))
-            case abc.Set():
-                return (TypeKey.SET, self.pack(*(so for so in o)))
-            case abc.Mapping():
-                return (TypeKey.DICT, self.pack(*sum(tuple(o.items()), start=())))
+            case abc.Sequence(): return self._encode_sequence(o)
+            case abc.Set(): return self._encode_set(o)
+            case abc.Mapping(): return self._encode_mapping(o)
         # Constants
         if o in Constants:
             return (TypeKey.CONSTANT, b'' if (o is None) and self.optimize_do_blanking else bytes((Constants.index(o),)))
@@ -152,8 +198,9 @@ class Packer:
         '''Encodes the object `o`, then tries representing it in literal form; returns the shortest'''
         et,ev = self.encode(o)
         if et in self.DONT_TRY_REPR: return (et, ev)
-        if ((let := self._try_encode_literal(o)) is None) \
-               or (len(let) > len(ev)): return (et, ev)
+        # the literal is only used if it is shorter, so only parse it (which is expensive for large containers) if it is
+        if len(r := repr(o)) > len(ev): return (et, ev)
+        if (let := self._try_encode_literal(o, r)) is None: return (et, ev)
         return (TypeKey.REPR, let.encode(self.str_encoding))
     # Archiving
     def sarchive(self, data: typing.Iterable[tuple[TypeKey, bytes]], stream: typing.BinaryIO):
@@ -62,12 +62,12 @@ class Config(UserDict):
                     return f'{self.DATA_PFX_ESC}{v[len(self.DATA_PFX):]}'
                 return v
             if isinstance(v, typing.Mapping):
-                return safe_dict(dict(v))
+                return dict(safe_dict(v))
             if isinstance(v, bytes):
                 return f'{self.DATA_PFX_ENCODED}{base85.encode(v)}'
             if isinstance(v, typing.Iterable):
                 return list(map(safe_v, v))
-            return f'{self.DATA_PFX_PACKED}{base85.encode(packlib.pack(v))}'
+            return f'{self.DATA_PFX_PACKED}{base85.encode(pack.pack(v))}'
         def safe_dict(d: dict) -> typing.Iterator[tuple[str, typing.Any]]:
             for k,v in d.items(): yield (k, safe_v(v))
         return self.to_map(delim, _data=dict(safe_dict(self.data))) | {
@@ -85,12 +85,13 @@ class Config(UserDict):
         for k,v in self.data.items():
             if not isinstance(v, str): continue
             if not v.startswith(self.DATA_PFX): continue
+            # the full prefixes are stripped directly, rather than splitting (and copying) the payload on `DATA_SUFF`
             if v.startswith(self.DATA_PFX_ESC):
-                self.data[k] = f'{self.DATA_PFX}{v[len(self.DATA_PFX_ESC):]}'
+                self.data[k] = f'{self.DATA_PFX}{v.removeprefix(self.DATA_PFX_ESC)}'
             elif v.startswith(self.DATA_PFX_ENCODED):
-                self.data[k] = base85.decode(v.split(self.DATA_SUFF, 1)[1])
+                self.data[k] = base85.decode(v.removeprefix(self.DATA_PFX_ENCODED))
             elif v.startswith(self.DATA_PFX_PACKED):
-                self.data[k] = packlib.unpack(base85.decode(v.split(self.DATA_SUFF, 1)[1]))[0]
+                self.data[k] = pack.unpack(base85.decode(v.removeprefix(self.DATA_PFX_PACKED)))[0]
             else:
                 raise ValueError(f'Found DATA_PFX {self.DATA_PFX!r}, but with an unknown reason, in key {k!r}\n value: {v!r}')
     @classmethod
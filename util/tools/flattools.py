@@ -4,7 +4,6 @@
 
 #> Imports
 import typing
-import itertools
 #</Imports
 
 #> Header >/
@@ -12,6 +11,7 @@ __all__ = ('flatten_map', 'extrude_map',
            'iflatten_seq', 'flatten_seq')
 
 # Maps
+_NOT_MAPPINGS = frozenset({str, bytes, int, float, bool, type(None), list, tuple}) # common value types that can skip the `Mapping` check
 def flatten_map(m: typing.Mapping[str, typing.Any], delim: str | None = None) -> dict[tuple[str, ...] | str, typing.Any]:
     '''
         Flattens `m` into a dictionary with no depth
@@ -19,28 +19,30 @@ def flatten_map(m: typing.Mapping[str, typing.Any], delim: str | None = None) ->
             otherwise each key is put in a tuple
     '''
     new = {}
-    for k,v in m.items():
-        if not isinstance(v, typing.Mapping):
-            new[(k,)] = v
-            continue
-        for ik,iv in flatten_map(v).items():
-            new[(k,)+ik] = iv
+    # walked depth-first with an explicit stack of iterators, so each key is only built once and order is preserved
+    stack = [((), iter(m.items()))]
+    while stack:
+        pfx,it = stack[-1]
+        for k,v in it:
+            tv = type(v)
+            if (tv is dict) or ((tv not in _NOT_MAPPINGS) and isinstance(v, typing.Mapping)):
+                stack.append((pfx+(k,), iter(v.items())))
+                break
+            new[pfx+(k,)] = v
+        else: stack.pop()
     if delim is not None:
         return {delim.join(k): v for k,v in new.items()}
     return new
 def extrude_map(m: typing.Mapping[tuple[str, ...] | str, typing.Any], delim: str | None = None) -> dict[str, typing.Any]:
     '''Reverses the effects of `flatten_map()`'''
     new = {}
-    for (l,k),_ in itertools.groupby(m.keys(), key=lambda k: ((len(k) if delim is None else k.count(delim)+1), k)):
-        assert l
-        ks = tuple(k if delim is None else k.split(delim))
-        if l == 1:
-            new[ks[0]] = m[k]
-            continue
-        if ks[0] not in new:
-            new[ks[0]] = {}
-        new[ks[0]][ks[1:]] = m[k]
-    return {k: (extrude_map(v) if isinstance(v, dict) else v) for k,v in new.items()}
+    # each key's path is walked once, reusing (or creating) each level's dict
+    for k,v in m.items():
+        *path,last = (k if delim is None else k.split(delim))
+        cwd = new
+        for p in path: cwd = cwd.setdefault(p, {})
+        cwd[last] = v
+    return new
 # Sequences
 def iflatten_seq(s: typing.Sequence, type_: type = typing.Sequence) -> typing.Iterator:
     '''
@@ -3,11 +3,14 @@
 '''Tools for working with files and paths'''
 
 #> Imports
+import os
+import shutil
 from pathlib import Path
+from tempfile import mkstemp
 #</Imports
 
 #> Header >/
-__all__ = ('clean_pycache', 'clean_empty')
+__all__ = ('clean_pycache', 'clean_empty', 'atomic_copy')
 
 def clean_pycache(root: Path):
     '''
@@ -28,3 +31,20 @@ def clean_empty(root: Path, include_root: bool = False):
         if fs: continue
         if not any(map(Path.exists, map(rp.joinpath, ds))):
             rp.rmdir()
+def atomic_copy(src: Path, dst: Path):
+    '''
+        Copies `src` to `dst` through a temporary file beside `dst`, which is then moved over it
+            `dst` is therefore never left partially written, even if copying fails part-way
+        If `dst` already exists, its permission bits are kept; otherwise, `src`'s are copied
+    '''
+    fd,tmp = mkstemp(dir=dst.parent, prefix=f'.{dst.name}.')
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp) # uses the kernel's zero-copy paths where available
+        # `mkstemp()` creates files that only the owner can access
+        try: shutil.copymode(dst, tmp)
+        except FileNotFoundError: shutil.copymode(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -3,50 +3,126 @@
 '''Common utilities for working with hashing algorithms'''
 
 #> Imports
+import os
 import typing
 import hashlib
-import multiprocessing.pool
 from pathlib import Path
-from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, cache
 
 from .functools import defaults, DEFAULT
 #</Imports
 
 #> Header >/
-__all__ = ('ALGORITHM_DEFAULT_LOW', 'ALGORITHM_DEFAULT_HIGH',
+__all__ = ('ALGORITHM_DEFAULT_LOW', 'ALGORITHM_DEFAULT_HIGH', 'THREADS_DEFAULT',
            'TAlgorithmsGuaranteed', 'TAlgorithmsAvailable',
-           'hash_many', 'hash_file', 'hash_files')
+           'hash_many', 'hash_file', 'hash_files',
+           'merkle_root', 'merkle_proof', 'merkle_verify')
 
 # Constants
 ALGORITHM_DEFAULT_LOW = 'sha1'
 ALGORITHM_DEFAULT_HIGH = 'sha512'
+# hashlib releases the GIL whilst hashing, so scale with the machine (this matches `ThreadPoolExecutor`'s own default)
+THREADS_DEFAULT = min(32, (os.cpu_count() or 1) + 4)
 
 # Types
 TAlgorithmsGuaranteed = typing.Literal[*hashlib.algorithms_guaranteed]
 TAlgorithmsAvailable = typing.Literal[*hashlib.algorithms_available]
 
 # Functions
-def hash_many(*datas: bytes, max_threads: int = 8, hash_method: str = ALGORITHM_DEFAULT_HIGH) -> tuple[bytes, ...]:
+@cache
+def _constructor(hash_method: str) -> typing.Callable[[bytes], 'hashlib._Hash']:
+    # Named constructors (`hashlib.sha1()`, etc.) are much faster than `hashlib.new()`,
+    #  so they are resolved once and preferred when available
+    if hash_method in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, hash_method)
+    # Otherwise, copying a pristine template skips `hashlib.new()`'s name lookup and context setup on every call
+    #  (the template itself is never updated, so it is safe to copy from multiple threads)
+    template = hashlib.new(hash_method)
+    def hcon(data: bytes = b'') -> 'hashlib._Hash':
+        h = template.copy()
+        h.update(data)
+        return h
+    return hcon
+def hash_many(*datas: bytes, max_threads: int = THREADS_DEFAULT, hash_method: str = ALGORITHM_DEFAULT_HIGH) -> tuple[bytes, ...]:
     '''Hashes multiple sets of bytes using multithreading'''
     procs = min(len(datas), max_threads)
-    hfunc = lambda b: hashlib.new(hash_method, b).digest()
+    hcon = _constructor(hash_method)
+    hfunc = lambda b: hcon(b).digest()
     if procs < 2: return tuple(map(hfunc, datas))
-    with multiprocessing.pool.ThreadPool(procs) as mp:
-        return tuple(mp.map(hfunc, datas))
+    with ThreadPoolExecutor(procs) as ex:
+        return tuple(ex.map(hfunc, datas))
 @defaults(hash_many)
-def hash_file(file: Path | str, hash_method: str = DEFAULT) -> bytes:
-    '''Opens and hashes a single `Path` (or string coerced into a `Path`)'''
+def hash_file(file: Path | str, hash_method: str = DEFAULT, *, missing_ok: bool = False) -> bytes | None:
+    '''
+        Opens and hashes a single `Path` (or string coerced into a `Path`)
+            The file is streamed into the hash unbuffered, so it is never entirely read into memory
+        If `missing_ok` is true, then `None` is returned instead of raising `FileNotFoundError` (or `NotADirectoryError`) if the file does not exist
+    '''
     if not isinstance(file, Path): file = Path(file)
-    with file.open('rb') as f:
-        return hashlib.file_digest(f, hash_method).digest()
+    try: f = file.open('rb', buffering=0)
+    except (FileNotFoundError, NotADirectoryError): # a parent being a file also means that the file doesn't exist
+        if missing_ok: return None
+        raise
+    with f:
+        if hasattr(os, 'posix_fadvise'): # hint sequential access to the kernel's readahead
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return hashlib.file_digest(f, _constructor(hash_method)).digest()
 @defaults(hash_many)
-def hash_files(*files: Path | str, max_threads: int = DEFAULT, hash_method: str = DEFAULT) -> dict[Path | str, bytes]:
+def hash_files(*files: Path | str, max_threads: int = DEFAULT, hash_method: str = DEFAULT, missing_ok: bool = False) -> dict[Path | str, bytes | None]:
     '''
         Opens and hashes multiple `Path`s (or strings coerced into `Path`s) using multithreading
             Note that, in the returned `dict`, keys that were strings will remain strings
+        See `hash_file()` for `missing_ok`
     '''
     paths = tuple(map(Path, files))
     procs = min(len(paths), max_threads)
-    if procs < 2: return dict(zip(files, map(partial(hash_file, hash_method=hash_method), paths)))
-    with multiprocessing.pool.ThreadPool(procs) as mp:
-        return dict(zip(files, mp.map(partial(hash_file, hash_method=hash_method), paths)))
+    hfunc = partial(hash_file, hash_method=hash_method, missing_ok=missing_ok)
+    if procs < 2: return dict(zip(files, map(hfunc, paths)))
+    with ThreadPoolExecutor(procs) as ex:
+        return dict(zip(files, ex.map(hfunc, paths)))
+
+# Merkle trees
+## Leaves and nodes are hashed with different prefixes to prevent second-preimage attacks (as in RFC 6962)
+def _merkle_leaf(hcon: typing.Callable[[bytes], 'hashlib._Hash'], data: bytes) -> bytes:
+    return hcon(b'\x00' + data).digest()
+def _merkle_node(hcon: typing.Callable[[bytes], 'hashlib._Hash'], left: bytes, right: bytes) -> bytes:
+    return hcon(b'\x01' + left + right).digest()
+def _merkle_levels(leaves: typing.Sequence[bytes], hcon: typing.Callable[[bytes], 'hashlib._Hash']) -> list[list[bytes]]:
+    # Builds every level of the tree, from the hashed leaves up to the root
+    #  nodes without a sibling are promoted to the next level unchanged
+    levels = [[_merkle_leaf(hcon, l) for l in leaves]]
+    while len(prev := levels[-1]) > 1:
+        levels.append([_merkle_node(hcon, prev[i], prev[i+1]) if (i+1) < len(prev) else prev[i]
+                       for i in range(0, len(prev), 2)])
+    return levels
+@defaults(hash_many)
+def merkle_root(*leaves: bytes, hash_method: str = DEFAULT) -> bytes:
+    '''
+        Computes the root of a Merkle tree built over `leaves`, in order
+            The root of an empty tree is the hash of no data
+    '''
+    if not leaves: return _constructor(hash_method)(b'').digest()
+    return _merkle_levels(leaves, _constructor(hash_method))[-1][0]
+@defaults(hash_many)
+def merkle_proof(index: int, *leaves: bytes, hash_method: str = DEFAULT) -> tuple[tuple[bool, bytes], ...]:
+    '''
+        Generates an inclusion proof for `leaves[index]` in the Merkle tree built over `leaves`
+            The proof is a tuple of `(sibling_is_left, sibling_hash)` pairs, from the leaf up to (but not including) the root
+    '''
+    if not (0 <= index < len(leaves)):
+        raise IndexError(f'Leaf index {index} out of range for {len(leaves)} leaf/leaves')
+    proof = []
+    for level in _merkle_levels(leaves, _constructor(hash_method))[:-1]:
+        if (sib := index ^ 1) < len(level):
+            proof.append((sib < index, level[sib]))
+        index //= 2
+    return tuple(proof)
+@defaults(hash_many)
+def merkle_verify(leaf: bytes, proof: typing.Iterable[tuple[bool, bytes]], root: bytes, *, hash_method: str = DEFAULT) -> bool:
+    '''Checks that `leaf` is a member of the Merkle tree with the given `root`, using a `proof` from `merkle_proof()`'''
+    hcon = _constructor(hash_method)
+    h = _merkle_leaf(hcon, leaf)
+    for left,sib in proof:
+        h = _merkle_node(hcon, sib, h) if left else _merkle_node(hcon, h, sib)
+    return h == root
@@ -4,6 +4,7 @@
 
 #> Imports
 import typing
+import itertools
 from collections import abc as cabc
 #</Imports
 
@@ -12,7 +13,7 @@ __all__ = ('concat_mappings', 'dictdir', 'filter_keys', 'map_vals', 'rmap_vals')
 
 def concat_mappings(*maps: typing.Mapping, type_: type[typing.Mapping] | typing.Callable[[tuple[tuple[typing.Any, typing.Any], ...]], typing.Any] = dict) -> typing.Mapping | typing.Any:
     '''Concatenates multiple mappings into a single one'''
-    return type_(sum(map(tuple, map(cabc.ItemsView, maps)), start=()))
+    return type_(tuple(itertools.chain.from_iterable(map(cabc.ItemsView, maps))))
 def dictdir(o: typing.Any) -> dict[str, typing.Any]:
     '''Gets an object's keys and values from its `__dict__` and `__slots__` attributes'''
     return {a: getattr(o, a) for a in getattr(o, '__slots__')} | getattr(o, '__dict__', {})